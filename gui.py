@@ -139,11 +139,13 @@ class MainWindow(QMainWindow):
         self.spin_copies.setMinimum(1)
         self.spin_copies.setValue(1)
         self.chk_print = QCheckBox("排版后打印")
+        self.chk_flatten = QCheckBox("将印章合并到页面")
         self.line_out = QLineEdit()
         self.line_out.setPlaceholderText("输出目录，留空使用源目录")
         self.btn_out = QPushButton("📁 选择输出目录")
         form.addRow("份数", self.spin_copies)
         form.addRow("打印", self.chk_print)
+        form.addRow("印章", self.chk_flatten)
         h_out = QHBoxLayout()
         h_out.addWidget(self.line_out)
         h_out.addWidget(self.btn_out)
@@ -296,6 +298,7 @@ class MainWindow(QMainWindow):
         out_dir = self.line_out.text().strip() or None
         do_print = self.chk_print.isChecked()
         copies = self.spin_copies.value()
+        flatten = self.chk_flatten.isChecked()
         generated: List[str] = []
         self.set_busy(True)
         self.statusBar().showMessage("正在排版与输出…")
@@ -304,7 +307,7 @@ class MainWindow(QMainWindow):
             for src in files:
                 r = read_pdf(src)
                 pages.extend(list(r.pages))
-            writer = two_up_vertical_pages(pages)
+            writer = two_up_vertical_pages(pages, flatten=flatten)
             base_name = "merged_2up.pdf"
             od = out_dir or os.path.dirname(files[0])
             out_path = os.path.join(od, base_name)
@@ -3,7 +3,11 @@ from copy import deepcopy
 from pypdf import PdfReader, PdfWriter
 from pypdf._page import PageObject
 from pypdf import Transformation
-from pypdf.generic import RectangleObject, DictionaryObject, NameObject, ArrayObject, FloatObject
+from pypdf.generic import RectangleObject, DictionaryObject, NameObject, ArrayObject, FloatObject, DecodedStreamObject, StreamObject, IndirectObject
+
+_ANNOT_FLAG_HIDDEN = 2
+_ANNOT_FLAG_PRINT = 4
+_ANNOT_FLAG_NOVIEW = 32
 
 def _cropbox_metrics(p: PageObject) -> tuple[float, float, float, float]:
     cb = RectangleObject(p.cropbox)
@@ -64,7 +68,106 @@ def _adjust_merged_annots(dst: PageObject, n1: int, dx1: float, dy1: float, n2:
     except Exception:
         pass
 
-def two_up_vertical(reader: PdfReader) -> PdfWriter:
+def _normal_appearance(o: DictionaryObject) -> Optional[IndirectObject | StreamObject]:
+    ap = o.get("/AP")
+    if not ap:
+        return None
+    ap = ap.get_object()
+    if "/N" not in ap:
+        return None
+    n = ap.raw_get("/N")
+    states = n.get_object()
+    if not isinstance(states, StreamObject):
+        state = o.get("/AS")
+        if state is None or state not in states:
+            return None
+        n = states.raw_get(state)
+    if not isinstance(n.get_object(), StreamObject):
+        return None
+    return n
+
+def _appearance_matrix(o: DictionaryObject, ap: StreamObject) -> Optional[tuple[float, float, float, float, float, float]]:
+    bbox = [float(v) for v in ap.get("/BBox", [0, 0, 0, 0])]
+    m = [float(v) for v in ap.get("/Matrix", [1, 0, 0, 1, 0, 0])]
+    xs: List[float] = []
+    ys: List[float] = []
+    for x, y in ((bbox[0], bbox[1]), (bbox[0], bbox[3]), (bbox[2], bbox[1]), (bbox[2], bbox[3])):
+        xs.append(m[0] * x + m[2] * y + m[4])
+        ys.append(m[1] * x + m[3] * y + m[5])
+    bw = max(xs) - min(xs)
+    bh = max(ys) - min(ys)
+    if bw == 0 or bh == 0:
+        return None
+    r = RectangleObject(o["/Rect"])
+    sx = float(r.width) / bw
+    sy = float(r.height) / bh
+    return sx, 0.0, 0.0, sy, float(r.left) - sx * min(xs), float(r.bottom) - sy * min(ys)
+
+def _flatten_annots(page: PageObject, writer: PdfWriter) -> None:
+    ann = page.get("/Annots")
+    if not ann:
+        return
+    original = page.raw_get("/Annots")
+    try:
+        ops: List[str] = []
+        forms: List[IndirectObject | StreamObject] = []
+        dropped = set()
+        for a in ann:
+            o = a.get_object()
+            flags = int(o.get("/F", 0))
+            if flags & (_ANNOT_FLAG_HIDDEN | _ANNOT_FLAG_NOVIEW) or not flags & _ANNOT_FLAG_PRINT:
+                continue
+            ap = _normal_appearance(o)
+            cm = _appearance_matrix(o, ap.get_object()) if ap is not None else None
+            if cm is None:
+                continue
+            forms.append(ap)
+            ops.append(" ".join(f"{v:.4f}" for v in cm))
+            dropped.add(id(o))
+            # the popup of a baked-in markup annotation has nothing left to open
+            popup = o.get("/Popup")
+            if popup is not None:
+                dropped.add(id(popup.get_object()))
+        if not ops:
+            return
+        kept = ArrayObject(a for a in ann if id(a.get_object()) not in dropped)
+        res = page.get("/Resources")
+        if res is None:
+            res = DictionaryObject()
+            page[NameObject("/Resources")] = res
+        res = res.get_object()
+        xobjs = res.get("/XObject")
+        if xobjs is None:
+            xobjs = DictionaryObject()
+            res[NameObject("/XObject")] = xobjs
+        xobjs = xobjs.get_object()
+        lines: List[str] = []
+        i = len(xobjs)
+        for ap, cm in zip(forms, ops):
+            while NameObject(f"/FlatAnnot{i}") in xobjs:
+                i += 1
+            name = NameObject(f"/FlatAnnot{i}")
+            xobjs[name] = ap if isinstance(ap, IndirectObject) else writer._add_object(ap)
+            lines.append(f"q {cm} cm {name} Do Q")
+        stream = DecodedStreamObject()
+        stream.set_data(("\n" + "\n".join(lines) + "\n").encode("latin-1"))
+        ref = writer._add_object(stream)
+        if kept:
+            page[NameObject("/Annots")] = kept
+        else:
+            del page[NameObject("/Annots")]
+        # the drawn appearances go in last, once the annotations are off the page
+        contents = page.raw_get("/Contents") if "/Contents" in page else None
+        if contents is None:
+            page[NameObject("/Contents")] = ref
+        elif isinstance(contents.get_object(), ArrayObject):
+            contents.get_object().append(ref)
+        else:
+            page[NameObject("/Contents")] = ArrayObject([contents, ref])
+    except Exception:
+        page[NameObject("/Annots")] = original
+
+def two_up_vertical(reader: PdfReader, flatten: bool = False) -> PdfWriter:
     writer = PdfWriter()
     pages = reader.pages
     n = len(pages)
@@ -90,10 +193,12 @@ def two_up_vertical(reader: PdfReader) -> PdfWriter:
         n1 = len(p1.get("/Annots") or [])
         n2 = len(p2.get("/Annots") or []) if p2 is not None else 0
         _adjust_merged_annots(page, n1, -l1, (blank_h - h1), n2, -l2 if p2 is not None else 0.0, 0.0)
+        if flatten:
+            _flatten_annots(page, writer)
         
     return writer
 
-def two_up_vertical_pages(pages: List[PageObject]) -> PdfWriter:
+def two_up_vertical_pages(pages: List[PageObject], flatten: bool = False) -> PdfWriter:
     writer = PdfWriter()
     n = len(pages)
     for i in range(0, n, 2):
@@ -118,6 +223,8 @@ def two_up_vertical_pages(pages: List[PageObject]) -> PdfWriter:
         n1 = len(p1.get("/Annots") or [])
         n2 = len(p2.get("/Annots") or []) if p2 is not None else 0
         _adjust_merged_annots(page, n1, -l1, (blank_h - h1), n2, -l2 if p2 is not None else 0.0, 0.0)
+        if flatten:
+            _flatten_annots(page, writer)
     return writer
 
 def write_writer(writer: PdfWriter, output_path: str) -> None:
@@ -5,11 +5,11 @@ from layoutInvoice import two_up_vertical, write_writer
 from printInvoice import print_pdf
 from gui import run_gui
 
-def process(input_path: str, output_dir: str | None, do_print: bool) -> None:
+def process(input_path: str, output_dir: str | None, do_print: bool, flatten: bool = False) -> None:
     pdfs = collect_pdfs(input_path)
     for src in pdfs:
         reader = read_pdf(src)
-        writer = two_up_vertical(reader)
+        writer = two_up_vertical(reader, flatten=flatten)
         name = os.path.splitext(os.path.basename(src))[0] + "_2up.pdf"
         out_dir = output_dir or os.path.dirname(src)
         out_path = os.path.join(out_dir, name)
@@ -25,12 +25,13 @@ def main() -> None:
     ap.add_argument("-i", "--input")
     ap.add_argument("-o", "--output")
     ap.add_argument("--no-print", action="store_true")
+    ap.add_argument("--flatten", action="store_true")
     ap.add_argument("--gui", action="store_true")
     args = ap.parse_args()
     if args.gui or not args.input:
         run_gui()
         return
-    process(args.input, args.output, not args.no_print)
+    process(args.input, args.output, not args.no_print, args.flatten)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file